@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+import base64
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from logging import Logger
+from typing import Any
+
+import requests
+from websockets.sync.client import ClientConnection, connect
+
+CHROME_BINARY: str = os.environ.get("CHROME_BINARY", "google-chrome")
+
+class CDPError(Exception):
+    pass
+
+class ChromeBrowser():
+    """A headless Chrome process driven over the Chrome DevTools Protocol.
+
+    Every browser gets its own profile so the HTTP cache survives between page loads without profile lock conflicts.
+    A browser is not thread safe, only use it from one thread at a time.
+
+    Args:
+        window_size (tuple[int,int], optional): The browser window size. Defaults to (1280, 800).
+        command_timeout (int, optional): Seconds to wait for the response to a protocol command. Defaults to 60.
+        page_load_timeout (int, optional): Seconds to wait for a page to fire its load event. Defaults to 60.
+    """
+    def __init__(self, window_size: tuple[int,int] = (1280, 800), command_timeout: int = 60, page_load_timeout: int = 60) -> None:
+        self.logger: Logger = logging.getLogger("Chrome")
+        self.command_timeout: int = command_timeout
+        self.page_load_timeout: int = page_load_timeout
+        self.profile_dir: str = tempfile.mkdtemp(prefix="ci-chrome-")
+        self.logger.info("Starting headless Chrome with profile %s", self.profile_dir)
+        self.process: subprocess.Popen = subprocess.Popen([
+            CHROME_BINARY,
+            "--headless",
+            "--no-sandbox",
+            "--disable-gpu",
+            f"--window-size={window_size[0]},{window_size[1]}",
+            "--disable-extensions",
+            "--ignore-certificate-errors",
+            "--disable-dev-shm-usage",  # https://developers.google.com/web/tools/puppeteer/troubleshooting#tips
+            f"--user-data-dir={self.profile_dir}/user-data",
+            f"--disk-cache-dir={self.profile_dir}/cache",
+            "--remote-debugging-port=0",  # Let Chrome pick a free port and write it to DevToolsActivePort
+            "about:blank"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._id: int = 0
+        self._events: list[dict[str,Any]] = []
+        try:
+            port: int = self._read_port()
+            targets: list[dict[str,Any]] = requests.get(f"http://127.0.0.1:{port}/json/list", timeout=10).json()
+            page: dict[str,Any] = next(target for target in targets if target["type"] == "page")
+            self.ws: ClientConnection = connect(page["webSocketDebuggerUrl"], max_size=None)
+            self.send("Page.enable")
+        except Exception as error:
+            self.quit()
+            raise CDPError(f"Failed to start Chrome: {error}") from error
+
+    def _read_port(self, timeout: int = 30) -> int:
+        """Wait for Chrome to write the DevTools port to the profile directory.
+
+        Raises:
+            CDPError: If Chrome exits or doesn't write the port in time.
+
+        Returns:
+            int: The remote debugging port.
+        """
+        port_file: str = f"{self.profile_dir}/user-data/DevToolsActivePort"
+        t_end: float = time.time() + timeout
+        while time.time() < t_end:
+            if self.process.poll() is not None:
+                raise CDPError(f"Chrome exited with code {self.process.returncode}")
+            try:
+                with open(port_file, "r", encoding="utf-8") as file:
+                    return int(file.readline())
+            except (OSError, ValueError):
+                time.sleep(0.1)
+        raise CDPError("Timed out waiting for the Chrome DevTools port")
+
+    def send(self, method: str, params: dict[str,Any] | None = None) -> dict[str,Any]:
+        """Send a protocol command and wait for its result. Events received in the meantime are kept for `wait_for_event()`.
+
+        Args:
+            method (str): The protocol method, e.g `Page.navigate`.
+            params (dict[str,Any], optional): The method parameters.
+
+        Raises:
+            CDPError: If the command returns an error.
+            TimeoutError: If there is no response within `command_timeout` seconds.
+
+        Returns:
+            dict[str,Any]: The command result.
+        """
+        self._id += 1
+        self.ws.send(json.dumps({"id": self._id, "method": method, "params": params or {}}))
+        t_end: float = time.time() + self.command_timeout
+        while True:
+            message: dict[str,Any] = json.loads(self.ws.recv(timeout=max(t_end - time.time(), 0)))
+            if message.get("id") != self._id:
+                self._events.append(message)
+                continue
+            if "error" in message:
+                raise CDPError(f"{method} failed: {message['error'].get('message')}")
+            return message.get("result", {})
+
+    def wait_for_event(self, method: str, timeout: int) -> dict[str,Any]:
+        """Wait for a protocol event.
+
+        Args:
+            method (str): The event name, e.g `Page.loadEventFired`.
+            timeout (int): Seconds to wait for the event.
+
+        Raises:
+            TimeoutError: If the event isn't received in time.
+
+        Returns:
+            dict[str,Any]: The event parameters.
+        """
+        for event in self._events:
+            if event.get("method") == method:
+                self._events.remove(event)
+                return event.get("params", {})
+        t_end: float = time.time() + timeout
+        while True:
+            message: dict[str,Any] = json.loads(self.ws.recv(timeout=max(t_end - time.time(), 0)))
+            if message.get("method") == method:
+                return message.get("params", {})
+
+    def get(self, url: str) -> None:
+        """Load a page and wait no more than `page_load_timeout` seconds for its load event.
+
+        After a timeout the page is still loading and may fire its load event later, so don't reuse the browser.
+
+        Args:
+            url (str): The url to load.
+
+        Raises:
+            CDPError: If the navigation fails, e.g the connection is refused.
+            TimeoutError: If the page doesn't finish loading in time.
+        """
+        self._events.clear()  # Don't pick up a load event from the previous page
+        result: dict[str,Any] = self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"Failed to load {url}: {result['errorText']}")
+        self.wait_for_event("Page.loadEventFired", self.page_load_timeout)
+
+    def wait_for_ready_state(self, timeout: int) -> None:
+        """Wait for `document.readyState` to be `complete`, e.g after a client side redirect started a new load.
+
+        Args:
+            timeout (int): Seconds to wait for the document.
+
+        Raises:
+            TimeoutError: If the document isn't complete in time.
+        """
+        t_end: float = time.time() + timeout
+        while True:
+            state: dict[str,Any] = self.send("Runtime.evaluate", {"expression": "document.readyState", "returnByValue": True})
+            if state.get("result", {}).get("value") == "complete":
+                return
+            if time.time() >= t_end:
+                raise TimeoutError(f"Document not complete after {timeout} seconds")
+            time.sleep(0.25)
+
+    def screenshot(self) -> bytes:
+        """Capture the visible part of the page body as a PNG, or the whole viewport if no part of the body is visible.
+
+        Returns:
+            bytes: The PNG data.
+        """
+        # Intersect the body with the viewport so long pages are not captured at their full document height.
+        body: dict[str,Any] = self.send("Runtime.evaluate", {
+            "expression": "(() => { const r = document.body && document.body.getBoundingClientRect();"
+                          " if (!r) return null;"
+                          " const x = Math.max(r.left, 0), y = Math.max(r.top, 0);"
+                          " return {x: x, y: y,"
+                          " width: Math.min(r.right, window.innerWidth) - x,"
+                          " height: Math.min(r.bottom, window.innerHeight) - y}; })()",
+            "returnByValue": True})
+        params: dict[str,Any] = {"format": "png"}
+        rect: dict[str,float] | None = body.get("result", {}).get("value")
+        if rect and rect["width"] > 0 and rect["height"] > 0:
+            # Only capture the page body instead of the whole viewport to keep the PNG small.
+            params["clip"] = {**rect, "scale": 1}
+        return base64.b64decode(self.send("Page.captureScreenshot", params)["data"])
+
+    def quit(self) -> None:
+        """Close the connection, stop Chrome and remove its profile."""
+        try:
+            if hasattr(self, "ws"):
+                self.ws.close()
+        finally:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
@@ -1,19 +1,26 @@
 #!/usr/bin/env python3
 
-from multiprocessing.pool import ThreadPool
-from threading import current_thread
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import current_thread, local, Lock, Event, Thread, Timer
+import atexit
+import gzip
+import io
 import os
 import shutil
+import tempfile
+from queue import Empty, SimpleQueue
 import time
+import warnings
 import logging
 from logging import Logger
 import mimetypes
 import requests
 import json
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
 from urllib3.util.retry import Retry
-from functools import wraps
-from typing import Callable, Any, Literal
+from functools import lru_cache, wraps
+from typing import Callable, Any, Iterator, Literal
 
 import boto3
 from boto3.exceptions import S3UploadFailedError
@@ -24,13 +31,57 @@ from docker.models.containers import Container, ExecResult
 from docker import DockerClient
 import anybadge
 from ansi2html import Ansi2HTMLConverter
-from selenium import webdriver
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.common.exceptions import TimeoutException, WebDriverException
 from jinja2 import Environment, FileSystemLoader, select_autoescape, Template
 from pyvirtualdisplay import Display
 
+from ci.cdp import CDPError, ChromeBrowser
+from ci.logger import flush_logging
+
 logger: Logger = logging.getLogger(__name__)
+# Only wait_for_endpoint makes requests with verify=False, to accept self signed certificates. Docker and boto3 verify TLS.
+# A global filter because warnings.catch_warnings() is not thread safe and tags are tested in parallel.
+warnings.filterwarnings("ignore", category=InsecureRequestWarning)
+
+_SCRIPT_DIR: str = os.path.dirname(os.path.realpath(__file__))
+_JINJA: Environment = Environment(autoescape=select_autoescape(enabled_extensions=("html", "xml"),default_for_string=True),
+                                  loader=FileSystemLoader(_SCRIPT_DIR), auto_reload=False, cache_size=-1)
+_TEMPLATE: Template = _JINJA.get_template("template.html")
+
+def _load_badges() -> dict[str, bytes]:
+    """Read the pre-rendered CI badges shipped next to this file, keyed by report status."""
+    badges: dict[str, bytes] = {}
+    for status in ("PASS", "FAIL"):
+        try:
+            with open(f"{_SCRIPT_DIR}/badge-{status.lower()}.svg", "rb") as file:
+                badges[status] = file.read()
+        except OSError:
+            logger.warning("Pre-rendered %s badge not found, falling back to anybadge", status)
+    return badges
+
+_BADGES: dict[str, bytes] = _load_badges()
+
+PKG_CMDS: dict[str, str] = {
+    "alpine": "apk info -v",
+    "debian": "apt list",
+    "ubuntu": "apt list",
+    "fedora": "rpm -qa",
+    "arch": "pacman -Q"
+    }
+
+# Text files that are gzipped before upload. Only files read by browsers, report.json and ci-status.yml
+# are also fetched by tools like curl that don't decode Content-Encoding.
+GZIP_EXTENSIONS: frozenset[str] = frozenset({".html", ".log", ".md", ".txt"})
+
+PUT_OBJECT_MAX_SIZE: int = 1 << 20  # Files up to this size are sent with a single put_object call
+
+INIT_DONE_MESSAGES: tuple[bytes, ...] = (b"[services.d] done.", b"[ls.io-init] done.")
+
+CONTENT_TYPE_OVERRIDES: dict[str, str] = {".yml": "text/yaml", ".md": "text/markdown"}
+
+@lru_cache(maxsize=None)
+def guess_content_type(ext: str) -> str:
+    """Return the content type for a lower case file extension, e.g `.html`. Defaults to `text/plain`."""
+    return CONTENT_TYPE_OVERRIDES.get(ext) or mimetypes.guess_type(f"file{ext}", strict=False)[0] or "text/plain"
 
 def testing(func: Callable):
     """If the DRY_RUN env is set and this decorator is used on a function it will return None                   
@@ -83,30 +134,24 @@ class SetEnvs():
     def convert_env(self, envs:str = None) -> dict[str,str]:
         """Convert env DOCKER_ENV to dictionary
 
+        Only the first `=` of a pair separates the key from the value, so values may contain `=`.
+        Pairs without a `=` are skipped with a warning.
+
         Args:
             envs (str, optional): A string with key values separated by the pipe symbol. e.g `key1=val1|key2=val2`. Defaults to None.
 
-        Raises:
-            CIError: Raises a CIError Exception if it failes to parse the string
-
         Returns:
             dict[str,str]: Returns a dictionary with our keys and values.
         """
-        env_dict: dict = {}
-        if envs:
-            self.logger.info("Converting envs")
-            try:
-                if "|" in envs:
-                    for varpair in envs.split("|"):
-                        var: list[str] = varpair.split("=")
-                        env_dict[var[0]] = var[1]
-                else:
-                    var = envs.split("=")
-                    env_dict[var[0]] = var[1]
-                env_dict["S6_VERBOSITY"] = os.environ.get("S6_VERBOSITY")
-            except Exception as error:
-                self.logger.exception("Failed to convert DOCKER_ENV: %s to dictionary!", envs)
-                raise CIError(f"Failed converting DOCKER_ENV: {envs} to dictionary") from error
+        if not envs:
+            return {}
+        self.logger.info("Converting envs")
+        pairs: list[str] = envs.split("|")
+        for pair in pairs:
+            if "=" not in pair:
+                self.logger.warning("Skipping DOCKER_ENV entry without '=': %s", pair)
+        env_dict: dict[str,str] = dict(pair.split("=", 1) for pair in pairs if "=" in pair)
+        env_dict["S6_VERBOSITY"] = os.environ.get("S6_VERBOSITY")
         return env_dict
 
 
@@ -126,6 +171,9 @@ class SetEnvs():
         except KeyError as error:
             self.logger.exception("Key is not set in ENV!")
             raise CIError(f"Key {error} is not set in ENV!") from error
+        self.pkg_cmd: str | None = PKG_CMDS.get(self.base)
+        if self.pkg_cmd is None:
+            self.logger.warning("Unknown BASE '%s', no package dump command available. Supported: %s", self.base, ", ".join(PKG_CMDS))
 
 
 class CI(SetEnvs):
@@ -139,14 +187,38 @@ class CI(SetEnvs):
         self.logger = logging.getLogger("LSIO CI")
         logging.getLogger("botocore.auth").setLevel(logging.INFO)  # Don"t log the S3 authentication steps.
 
-        self.client: DockerClient = docker.from_env()
+        self._local = local()  # Holds one docker client per worker thread
+        self._lock = Lock()  # Guards the state shared by the worker threads while tags are tested in parallel
         self.tags = list(self.tags_env.split("|"))
         self.tag_report_tests:dict[str,dict[str,dict]] = {tag: {"test":{}} for tag in self.tags} # Adds all the tags as keys with an empty dict as value to the dict
         self.report_containers: dict[str,dict[str,dict]] = {}
         self.report_status = "PASS"
-        self.outdir: str = f"{os.path.dirname(os.path.realpath(__file__))}/output/{self.image}/{self.meta_tag}"
+        self._script_dir: str = _SCRIPT_DIR
+        self.outdir: str = f"{self._script_dir}/output/{self.image}/{self.meta_tag}"
+        self.index_file: str = f"{self.outdir}/index.html"
         os.makedirs(self.outdir, exist_ok=True)
+        self._workdir: str = tempfile.mkdtemp(prefix="ci-work-")  # Scratch files that should not end up in the uploaded report
+        atexit.register(shutil.rmtree, self._workdir, ignore_errors=True)
         self.s3_client = self.create_s3_client()
+        self._idle_browsers: SimpleQueue[ChromeBrowser] = SimpleQueue()  # Browsers that are not in use by a thread
+        self._browsers: list[ChromeBrowser] = []  # Every browser started, so they can be quit on exit
+        self._pending_uploads: list[tuple[str, bytes, str]] = []  # In memory files (name, body, content type) for report_upload
+        self._log_streams: dict[str, tuple[Any, Thread]] = {}  # The followed log stream and writer thread of each tag
+        atexit.register(self.quit_browsers)
+
+    @property
+    def client(self) -> DockerClient:
+        """Return the docker client of the calling thread.
+
+        The HTTP session of a docker client is not safe to share between threads under load,
+        so every worker thread lazily creates its own client.
+
+        Returns:
+            DockerClient: A docker client bound to the current thread.
+        """
+        if not hasattr(self._local, "client"):
+            self._local.client = docker.from_env()
+        return self._local.client
 
     def run(self,tags: list) -> None:
         """Will iterate over all the tags running container_test() on each tag, multithreaded.
@@ -155,15 +227,19 @@ class CI(SetEnvs):
             `tags` (list): All the tags we will test on the image.
 
         """
-        thread_pool = ThreadPool(processes=10)
-        thread_pool.map(self.container_test,tags)
-        display = Display(size=(1920, 1080)) # Setup an x virtual frame buffer (Xvfb) that Selenium can use during the tests.
+        display = Display(size=(1920, 1080)) # Setup an x virtual frame buffer (Xvfb) that Chrome can use during the tests.
         display.start()
-        thread_pool.close()
-        thread_pool.join()
-        display.stop()
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(tags), (os.cpu_count() or 1) * 2)) as executor:
+                futures = {executor.submit(self.container_test, tag): tag for tag in tags}
+                results: dict[str,dict[str,Any]] = {futures[future]: future.result() for future in as_completed(futures)}
+        finally:
+            display.stop()
+        self.report_containers.update(results)
+        if any(not result["test_success"] for result in results.values()):
+            self.report_status = "FAIL"
 
-    def container_test(self, tag: str) -> None:
+    def container_test(self, tag: str) -> dict[str,Any]:
         """Main container test logic.
 
         Args:
@@ -175,65 +251,79 @@ class CI(SetEnvs):
         3. Export the package info from the Container object.
         4. Take a screenshot for the report.
         5. Add report information to report.json.
+
+        Returns:
+            dict[str,Any]: The report entry of the tag, see `_endtest()`.
         """
         # Name the thread for easier debugging.
         current_thread().name = f"{self.get_platform(tag).upper()}Thread"
+        container: Container | None = None
+        build_info: dict[str,str] = {"version": "ERROR", "created": "ERROR", "size": "ERROR", "maintainer": "ERROR"}
+        try:
+            # Start the container
+            self.logger.info("Starting test of: %s", tag)
+            container = self.client.containers.run(f"{self.image}:{tag}",
+                                                   detach=True,
+                                                   environment=self.dockerenv)
+            container_config: list[str] = container.attrs["Config"]["Env"]
+            self.logger.info("Container config of tag %s: %s",tag,container_config)
+
+            logsfound: bool = self.watch_container_logs(container, tag) # Watch the logs for no more than 5 minutes
+            if not logsfound:
+                return self._endtest(container, tag, "ERROR", "ERROR", False)
+
+            # build_version: str = self.get_build_version(container,tag) # Get the image build version
+            build_info = self.get_build_info(container,tag) # Get the image build info
+            if build_info["version"] == "ERROR":
+                return self._endtest(container, tag, build_info, "ERROR", False)
+
+            sbom: str = self.generate_sbom(tag)
+            if sbom == "ERROR":
+                return self._endtest(container, tag, build_info, sbom, False)
+
+            # Screenshot web interface and check connectivity
+            if self.screenshot == "true":
+                self.take_screenshot(container, tag)
+
+            self.logger.info("Testing of %s PASSED", tag)
+            return self._endtest(container, tag, build_info, sbom, True)
+        except Exception as error:
+            self.logger.exception("Testing of %s raised an unhandled exception", tag)
+            self.tag_report_tests[tag]["test"]["Run test"] = (dict(sorted({
+                "status":"FAIL",
+                "message":str(error)}.items())))
+            return self._endtest(container, tag, build_info, "ERROR", False)
 
-        # Start the container
-        self.logger.info("Starting test of: %s", tag)
-        container: Container = self.client.containers.run(f"{self.image}:{tag}",
-                                               detach=True,
-                                               environment=self.dockerenv)
-        container_config: list[str] = container.attrs["Config"]["Env"]
-        self.logger.info("Container config of tag %s: %s",tag,container_config)
-
-
-        logsfound: bool = self.watch_container_logs(container, tag) # Watch the logs for no more than 5 minutes
-        if not logsfound:
-            self._endtest(container, tag, "ERROR", "ERROR", False)
-            return
-
-        # build_version: str = self.get_build_version(container,tag) # Get the image build version
-        build_info: dict = self.get_build_info(container,tag) # Get the image build info
-        if build_info["version"] == "ERROR":
-            self._endtest(container, tag, build_info, "ERROR", False)
-            return
-
-        sbom: str = self.generate_sbom(tag)
-        if sbom == "ERROR":
-            self._endtest(container, tag, build_info, sbom, False)
-            return
-
-        # Screenshot web interface and check connectivity
-        if self.screenshot == "true":
-            self.take_screenshot(container, tag)
-
-        self._endtest(container, tag, build_info, sbom, True)
-        self.logger.info("Testing of %s PASSED", tag)
-        return
-
-    def _endtest(self: "CI", container:Container, tag:str, build_info:dict[str,str], packages:str, test_success: bool) -> None:
-        """End the test with as much info as we have and append to the report.
+    def _endtest(self: "CI", container:Container | None, tag:str, build_info:dict[str,str], packages:str, test_success: bool) -> dict[str,Any]:
+        """End the test with as much info as we have and build the report entry of the tag.
 
         Args:
-            `container` (Container): Container object
+            `container` (Container | None): Container object, None if the container never started
             `tag` (str): The container tag
             `build_info` (str): Information about the build (version, size etc)
             `packages` (str): SBOM dump from the container
             `test_success` (bool): If the testing of the container failed or not
+
+        Returns:
+            dict[str,Any]: The report entry of the tag.
         """
-        logblob: Any = container.logs().decode("utf-8")
+        logblob: str = ""
+        if container is not None:
+            try:
+                logblob = self.stop_log_stream(container, tag)
+            except Exception:
+                self.logger.exception("Failed to get the container logs of %s", tag)
+            try:
+                container.remove(force="true")
+            except APIError:
+                self.logger.exception("Failed to remove container %s",tag)
         self.create_html_ansi_file(logblob, tag, "log") # Generate html container log file based on the latest logs
-        try:
-            container.remove(force="true")
-        except APIError:
-            self.logger.exception("Failed to remove container %s",tag)
         warning_texts: dict[str, str] = {
             "dotnet": "May be a .NET app. Service might not start on ARM32 with QEMU",
             "uwsgi": "This image uses uWSGI and might not start on ARM/QEMU"
         }
         # Add the info to the report
-        self.report_containers[tag] = {
+        report: dict[str,Any] = {
             "logs": logblob,
             "sysinfo": packages,
             "warnings": {
@@ -245,7 +335,8 @@ class CI(SetEnvs):
             "test_results": self.tag_report_tests[tag]["test"],
             "test_success": test_success,
             }
-        self.report_containers[tag]["has_warnings"] = any(warning[1] for warning in self.report_containers[tag]["warnings"].items())
+        report["has_warnings"] = any(warning[1] for warning in report["warnings"].items())
+        return report
 
     def get_platform(self, tag: str) -> str:
         """Check the 5 first characters of the tag and return the platform.
@@ -278,16 +369,11 @@ class CI(SetEnvs):
             str: Return the output of the dump command or "ERROR"
         """
         # Dump package information
-        dump_commands: dict[str, str] = {
-            "alpine": "apk info -v",
-            "debian": "apt list",
-            "ubuntu": "apt list",
-            "fedora": "rpm -qa",
-            "arch": "pacman -Q"
-            }
         try:
             self.logger.info("Dumping package info for %s",tag)
-            info: ExecResult = container.exec_run(dump_commands[self.base])
+            if self.pkg_cmd is None:
+                raise CIError(f"No package dump command for BASE: {self.base}")
+            info: ExecResult = container.exec_run(self.pkg_cmd)
             packages: str = info[1].decode("utf-8")
             if info[0] != 0:
                 raise CIError(f"Failed to dump packages. Output: {packages}")
@@ -326,7 +412,7 @@ class CI(SetEnvs):
         while time.time() < t_end:
             time.sleep(5)
             try:
-                logblob: str = syft.logs().decode("utf-8")
+                logblob: str = self.client.api.logs(syft.id).decode("utf-8")
                 if "VERSION" in logblob:
                     self.logger.info("Get package versions for %s completed", tag)
                     self.tag_report_tests[tag]["test"]["Create SBOM"] = (dict(sorted({
@@ -343,7 +429,6 @@ class CI(SetEnvs):
                 error_message: APIError | ContainerError | ImageNotFound = error
                 self.logger.exception("Creating SBOM package list on %s: FAIL", tag)
         self.logger.error("Failed to generate SBOM output on tag %s. SBOM output:\n%s",tag, logblob)
-        self.report_status = "FAIL"
         self.tag_report_tests[tag]["test"]["Create SBOM"] = (dict(sorted({
             "Create SBOM":"FAIL",
             "message":str(error_message)}.items())))
@@ -422,12 +507,13 @@ class CI(SetEnvs):
             self.tag_report_tests[tag]["test"]["Get build info"] = (dict(sorted({
                 "status":"FAIL",
                 "message":str(error)}.items())))
-            self.report_status = "FAIL"
         return build_info
 
     def watch_container_logs(self, container:Container, tag:str) -> bool:
-        """Tail the container logs for 5 minutes and look for the init done message that tells us the container started up
-        successfully.
+        """Follow the container log stream for no more than `DOCKER_LOGS_DELAY` seconds and look for the init done message
+        that tells us the container started up successfully.
+
+        If the image defines a HEALTHCHECK we wait for the container to report healthy instead of the init done message.
 
         Args:
             container (Container): The container we are testing
@@ -436,44 +522,132 @@ class CI(SetEnvs):
         Returns:
             bool: Return True if the "done" message is found, otherwise False.
         """
-        t_end: float = time.time() + int(self.logs_delay)
         self.logger.info("Tailing the %s logs for %s seconds looking for the 'done' message", tag, self.logs_delay)
-        while time.time() < t_end:
-            try:
-                logblob: str = container.logs().decode("utf-8")
-                if "[services.d] done." in logblob or "[ls.io-init] done." in logblob:
-                    self.logger.info("Container startup completed for %s", tag)
-                    self.tag_report_tests[tag]["test"]["Container startup"] = (dict(sorted({
-                        "status":"PASS",
-                        "message":"-"}.items())))
-                    self.logger.info("Container startup %s: PASS", tag)
-                    return True
-                time.sleep(1)
-            except APIError as error:
-                self.logger.exception("Container startup %s: FAIL - INIT NOT FINISHED", tag)
-                self.tag_report_tests[tag]["test"]["Container startup"] = (dict(sorted({
-                    "status":"FAIL",
-                    "message": f"INIT NOT FINISHED: {str(error)}"
-                    }.items())))
-                self.report_status = "FAIL"
-                return False
+        try:
+            log_stream = self.client.api.logs(container.id, stream=True, follow=True, stdout=True, stderr=True)
+        except APIError as error:
+            self.logger.exception("Container startup %s: FAIL - INIT NOT FINISHED", tag)
+            self.tag_report_tests[tag]["test"]["Container startup"] = (dict(sorted({
+                "status":"FAIL",
+                "message": f"INIT NOT FINISHED: {str(error)}"
+                }.items())))
+            return False
+        init_done = Event()
+        log_path: str = f"{self._workdir}/{tag}.log"
+        writer = Thread(target=self._stream_logs, args=(log_stream, log_path, init_done), name=f"{current_thread().name}Logs", daemon=True)
+        writer.start()
+        with self._lock:
+            self._log_streams[tag] = (log_stream, writer)
+        healthcheck: dict[str,Any] = container.attrs["Config"].get("Healthcheck") or {}
+        if healthcheck.get("Test", ["NONE"])[0] != "NONE":  # HEALTHCHECK NONE is stored as {"Test": ["NONE"]}
+            found: bool = self.wait_for_healthy(container, tag)
+        else:
+            found = init_done.wait(timeout=int(self.logs_delay))
+        if found:
+            self.logger.info("Container startup completed for %s", tag)
+            self.tag_report_tests[tag]["test"]["Container startup"] = (dict(sorted({
+                "status":"PASS",
+                "message":"-"}.items())))
+            self.logger.info("Container startup %s: PASS", tag)
+            return True
         self.logger.error("Container startup failed for %s", tag)
         self.tag_report_tests[tag]["test"]["Container startup"] = (dict(sorted({
             "status":"FAIL",
             "message":"INIT NOT FINISHED"}.items())))
         self.logger.error("Container startup %s: FAIL - INIT NOT FINISHED", tag)
-        self.report_status = "FAIL"
         return False
 
+    def wait_for_healthy(self, container:Container, tag:str) -> bool:
+        """Block on the docker health_status events of the container for no more than `DOCKER_LOGS_DELAY` seconds.
+
+        Args:
+            container (Container): The container we are testing
+            tag (str): The tag we are testing
+
+        Returns:
+            bool: Return True if the container reports healthy, otherwise False.
+        """
+        self.logger.info("Waiting up to %s seconds for %s to report healthy", self.logs_delay, tag)
+        try:
+            events = self.client.api.events(filters={"container": container.id, "event": "health_status"}, decode=True)
+        except APIError:
+            self.logger.exception("Failed to subscribe to the health events of %s", tag)
+            return False
+        timer = Timer(int(self.logs_delay), events.close)  # Closing the stream ends the loop below on timeout
+        timer.start()
+        try:
+            # Subscribe first and then check the current state so we can't miss the event in between.
+            if self.client.api.inspect_container(container.id)["State"].get("Health", {}).get("Status") == "healthy":
+                return True
+            for event in events:
+                if event.get("Action") == "health_status: healthy":
+                    return True
+        except Exception:
+            if timer.is_alive():
+                self.logger.exception("Failed to read the health events of %s", tag)
+        finally:
+            timer.cancel()
+            events.close()
+        return False
+
+    def _stream_logs(self, log_stream: Iterator[bytes], log_path: str, init_done: Event) -> None:
+        """Write a container log stream to `log_path` and set `init_done` once an init done message shows up.
+
+        Runs until the stream is closed by `stop_log_stream()` or the container exits.
+
+        Args:
+            log_stream (Iterator[bytes]): The streaming container logs.
+            log_path (str): The file the logs are written to.
+            init_done (Event): Event that is set when the init done message is found.
+        """
+        tail: bytes = b""
+        try:
+            with open(log_path, "wb") as file:
+                for chunk in log_stream:
+                    file.write(chunk)
+                    if init_done.is_set():
+                        continue
+                    # Keep the end of the previous chunk around in case a message is split across chunks.
+                    window: bytes = tail + chunk
+                    if any(message in window for message in INIT_DONE_MESSAGES):
+                        file.flush()
+                        init_done.set()
+                    tail = window[-32:]
+        except Exception:
+            self.logger.debug("Log stream of %s closed", log_path)
+
+    def stop_log_stream(self, container:Container, tag:str) -> str:
+        """Stop following the container logs and return everything that was written to disk.
+
+        Falls back to fetching the logs from docker if the logs were never streamed.
+
+        Args:
+            container (Container): The container we are testing
+            tag (str): The tag we are testing
+
+        Returns:
+            str: The container logs
+        """
+        with self._lock:
+            streamed: tuple[Any, Thread] | None = self._log_streams.pop(tag, None)
+        if streamed is None:
+            return self.client.api.logs(container.id).decode("utf-8")
+        log_stream, writer = streamed
+        log_stream.close()  # Cancels the chunked HTTP response so the writer thread exits
+        writer.join(timeout=10)
+        try:
+            with open(f"{self._workdir}/{tag}.log", "r", encoding="utf-8", errors="replace") as file:
+                return file.read()
+        except OSError:
+            self.logger.exception("Failed to read the streamed logs of %s, fetching them from docker", tag)
+            return self.client.api.logs(container.id).decode("utf-8")
+
     def report_render(self) -> None:
         """Render the index file for upload"""
         self.logger.info("Rendering Report")
-        env = Environment(autoescape=select_autoescape(enabled_extensions=("html", "xml"),default_for_string=True),
-                          loader = FileSystemLoader(os.path.dirname(os.path.realpath(__file__))) )
-        template: Template = env.get_template("template.html")
         self.report_containers = json.loads(json.dumps(self.report_containers,sort_keys=True))
-        with open(f"{self.outdir}/index.html", mode="w", encoding="utf-8") as file_:
-            file_.write(template.render(
+        with open(self.index_file, mode="w", encoding="utf-8") as file_:
+            file_.write(_TEMPLATE.render(
             report_containers=self.report_containers,
             report_status=self.report_status,
             meta_tag=self.meta_tag,
@@ -487,9 +661,13 @@ class CI(SetEnvs):
         """Render the badge file for upload"""
         self.logger.info("Creating badge")
         try:
-            badge = anybadge.Badge("CI", self.report_status, thresholds={
-                                   "PASS": "green", "FAIL": "red"})
-            badge.write_badge(f"{self.outdir}/badge.svg")
+            if self.report_status in _BADGES:
+                with open(f"{self.outdir}/badge.svg", "wb") as file:
+                    file.write(_BADGES[self.report_status])
+            else:
+                badge = anybadge.Badge("CI", self.report_status, thresholds={
+                                       "PASS": "green", "FAIL": "red"})
+                badge.write_badge(f"{self.outdir}/badge.svg")
             with open(f"{self.outdir}/ci-status.yml", "w", encoding="utf-8") as file:
                 file.write(f"CI: '{self.report_status}'")
         except (ValueError,RuntimeError,FileNotFoundError,OSError):
@@ -514,20 +692,30 @@ class CI(SetEnvs):
         """
         self.logger.info("Uploading report files")
         try:
-            shutil.copyfile(f"{os.path.dirname(os.path.realpath(__file__))}/404.jpg", f"{self.outdir}/404.jpg")
-            shutil.copyfile(f"{os.path.dirname(os.path.realpath(__file__))}/logo.jpg", f"{self.outdir}/logo.jpg")
-            shutil.copyfile(f"{os.path.dirname(os.path.realpath(__file__))}/favicon.ico", f"{self.outdir}/favicon.ico")
+            shutil.copyfile(f"{self._script_dir}/404.jpg", f"{self.outdir}/404.jpg")
+            shutil.copyfile(f"{self._script_dir}/logo.jpg", f"{self.outdir}/logo.jpg")
+            shutil.copyfile(f"{self._script_dir}/favicon.ico", f"{self.outdir}/favicon.ico")
         except Exception:
             self.logger.exception("Failed to copy 404/favicon/logo file!")
-        # Loop through files in outdir and upload
-        for filename in os.listdir(self.outdir):
-            time.sleep(0.5)
-            ctype: tuple[str | None, str | None] = mimetypes.guess_type(filename.lower(), strict=False)
-            ctype = {"ContentType": ctype[0] if ctype[0] else "text/plain", "ACL": "public-read", "CacheControl": "no-cache"}  # Set content types for files
+        # Upload all the files in outdir in parallel, the S3 client is thread safe.
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = []
+            for filename, body, mime in self._pending_uploads:
+                ctype = {"ContentType": mime, "ACL": "public-read", "CacheControl": "no-cache"}
+                futures.append(executor.submit(self.upload_bytes, body, filename, ctype))
+            in_memory: set[str] = {filename for filename, _, _ in self._pending_uploads}
+            for filename in os.listdir(self.outdir):
+                if filename in in_memory:
+                    continue
+                ctype = {"ContentType": guess_content_type(os.path.splitext(filename)[1].lower()), "ACL": "public-read", "CacheControl": "no-cache"}  # Set content types for files
+                futures.append(executor.submit(self.upload_file, f"{self.outdir}/{filename}", filename, ctype))
             try:
-                self.upload_file(f"{self.outdir}/{filename}", filename, ctype)
+                for future in as_completed(futures):
+                    future.result()
             except (S3UploadFailedError, ValueError, ClientError) as error:
                 self.logger.exception("Upload Error!")
+                for pending in futures:
+                    pending.cancel()
                 self.log_upload()
                 raise CIError(f"Upload Error: {error}") from error
         self.logger.info("Report available on https://%s/%s/%s/index.html",self.bucket, self.image, self.meta_tag)
@@ -555,16 +743,61 @@ class CI(SetEnvs):
     def upload_file(self, file_path:str, object_name:str, content_type:dict) -> None:
         """Upload a file to an S3 bucket
 
+        The file is uploaded once to the meta tag directory and then copied server side to the latest directory.
+        Text files are gzipped in memory and uploaded with `ContentEncoding: gzip`.
+        Small files are sent with a single `put_object` call, larger ones go through the transfer manager.
+
         Args:
             `file_path` (str): File to upload
-            `bucket` (str): Bucket to upload to
             `object_name` (str): S3 object name.
+            `content_type` (dict): Extra arguments for the S3 object, e.g. ContentType and ACL.
         """
         self.logger.info("Uploading %s to %s bucket",file_path, self.bucket)
+        if os.path.splitext(object_name)[1].lower() not in GZIP_EXTENSIONS and os.path.getsize(file_path) > PUT_OBJECT_MAX_SIZE:
+            self.s3_client.upload_file(file_path, self.bucket, f"{self.image}/{self.meta_tag}/{object_name}", ExtraArgs=content_type)
+            self._copy_to_latest(object_name, content_type)
+            return
+        with open(file_path, "rb") as file:
+            self.upload_bytes(file.read(), object_name, content_type)
+
+    @testing
+    def upload_bytes(self, body:bytes, object_name:str, content_type:dict) -> None:
+        """Upload an in memory object to an S3 bucket
+
+        Same as `upload_file()` for data that never touched the disk.
+
+        Args:
+            `body` (bytes): The object data.
+            `object_name` (str): S3 object name.
+            `content_type` (dict): Extra arguments for the S3 object, e.g. ContentType and ACL.
+        """
+        destination_dir: str = f"{self.image}/{self.meta_tag}"
+        if os.path.splitext(object_name)[1].lower() in GZIP_EXTENSIONS:
+            content_type = {**content_type, "ContentEncoding": "gzip"}
+            body = gzip.compress(body)
+        if len(body) > PUT_OBJECT_MAX_SIZE:
+            self.s3_client.upload_fileobj(io.BytesIO(body), self.bucket, f"{destination_dir}/{object_name}", ExtraArgs=content_type)
+        else:
+            self._put(f"{destination_dir}/{object_name}", body, content_type)
+        self._copy_to_latest(object_name, content_type)
+
+    def _copy_to_latest(self, object_name:str, content_type:dict) -> None:
+        """Copy an uploaded object server side from the meta tag directory to the latest directory."""
         destination_dir: str = f"{self.image}/{self.meta_tag}"
         latest_dir: str = f"{self.image}/latest"
-        self.s3_client.upload_file(file_path, self.bucket, f"{destination_dir}/{object_name}", ExtraArgs=content_type)
-        self.s3_client.upload_file(file_path, self.bucket, f"{latest_dir}/{object_name}", ExtraArgs=content_type)
+        self.s3_client.copy_object(Bucket=self.bucket, Key=f"{latest_dir}/{object_name}",
+                                   CopySource={"Bucket": self.bucket, "Key": f"{destination_dir}/{object_name}"},
+                                   MetadataDirective="REPLACE", **content_type)
+
+    def _put(self, key:str, body:bytes, extra_args:dict) -> None:
+        """Upload an in memory object to S3 with a single PutObject request.
+
+        Args:
+            `key` (str): S3 object key.
+            `body` (bytes): The object data.
+            `extra_args` (dict): Extra arguments for the S3 object, e.g. ContentType and ACL.
+        """
+        self.s3_client.put_object(Bucket=self.bucket, Key=key, Body=body, **extra_args)
 
     def log_upload(self) -> None:
         """Upload the ci.log to S3
@@ -574,6 +807,7 @@ class CI(SetEnvs):
             Exception: ClientError
         """
         self.logger.info("Uploading logs")
+        flush_logging()  # Make sure the queued records are in ci.log before we read it
         try:
             self.upload_file(f"{self.outdir}/ci.log", "ci.log", {"ContentType": "text/plain", "ACL": "public-read"})
             with open(f"{self.outdir}/ci.log","r", encoding="utf-8") as logs:
@@ -584,29 +818,105 @@ class CI(SetEnvs):
             self.logger.exception("Failed to upload the CI logs!")
 
 
+    def _get_browser(self) -> ChromeBrowser:
+        """Return an idle Chrome browser, or start a new one if all of them are in use.
+
+        Returns:
+            ChromeBrowser: A Chrome browser reserved for the calling thread
+        """
+        try:
+            return self._idle_browsers.get_nowait()
+        except Empty:
+            browser: ChromeBrowser = self.setup_browser()
+            with self._lock:
+                self._browsers.append(browser)
+            return browser
+
+    def _release_browser(self, browser: ChromeBrowser | None) -> None:
+        """Hand a browser back so the next tag can reuse the running browser and its cache."""
+        if browser is not None:
+            self._idle_browsers.put(browser)
+
+    def _discard_browser(self, browser: ChromeBrowser | None) -> None:
+        """Quit a browser and make sure it is not reused."""
+        if browser is None:
+            return
+        with self._lock:
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+        try:
+            browser.quit()
+        except Exception:
+            self.logger.exception("Failed to quit the browser")
+
+    def quit_browsers(self) -> None:
+        """Quit all the Chrome browser instances"""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            try:
+                browser.quit()
+            except Exception:
+                self.logger.exception("Failed to quit the browser")
+
+    def wait_for_endpoint(self, endpoint:str, tag:str) -> bool:
+        """Poll the web endpoint of the container for no more than `DELAY_START` seconds until it answers.
+
+        Any HTTP response counts as ready, even an error status, since we only care that the web server is up.
+
+        Args:
+            `endpoint` (str): The container endpoint.
+            `tag` (str): The container tag we are testing.
+
+        Returns:
+            bool: True if the endpoint answered, otherwise False.
+        """
+        self.logger.info("Waiting up to %s seconds for the web endpoint on %s", self.test_container_delay, tag)
+        t_end: float = time.time() + int(self.test_container_delay)
+        with requests.Session() as session:
+            while True:
+                try:
+                    session.get(endpoint, timeout=1, verify=False)
+                    return True
+                except requests.RequestException:
+                    if time.time() >= t_end:
+                        break
+                    time.sleep(1)
+        self.logger.warning("The web endpoint on %s did not answer within %s seconds", tag, self.test_container_delay)
+        return False
+
     def take_screenshot(self, container: Container, tag:str) -> None:
-        """Take a screenshot and save it to self.outdir
+        """Take a screenshot and queue it for upload with report_upload()
 
-        Takes a screenshot using a ChromiumDriver instance.
+        Takes a screenshot using a headless Chrome instance over the DevTools protocol.
 
         Args:
             `container` (Container): Container object
             `tag` (str): The container tag we are testing.
         """
         proto: Literal["https", "http"] = "https" if self.ssl.upper() == "TRUE" else "http"
-        # Sleep for the user specified amount of time
-        self.logger.info("Sleeping for %s seconds before reloading container: %s and refreshing container attrs", self.test_container_delay, container.image)
-        time.sleep(int(self.test_container_delay))
-        container.reload()
+        browser: ChromeBrowser | None = None
         try:
-            ip_adr: str = container.attrs["NetworkSettings"]["Networks"]["bridge"]["IPAddress"]
+            ip_adr: str = self.client.api.inspect_container(container.id)["NetworkSettings"]["Networks"]["bridge"]["IPAddress"]
             endpoint: str = f"{proto}://{self.webauth}@{ip_adr}:{self.port}{self.webpath}"
-            driver: WebDriver = self.setup_driver()
-            driver.get(endpoint)
-            self.logger.info("Sleeping for %s seconds before creating a screenshot on %s", self.screenshot_delay, tag)
-            time.sleep(int(self.screenshot_delay))
+            if not self.wait_for_endpoint(endpoint, tag):
+                self.tag_report_tests[tag]["test"]["Get screenshot"] = (dict(sorted({
+                    "status":"FAIL",
+                    "message":f"CONNECTION ERROR: endpoint did not answer within {self.test_container_delay} seconds"}.items())))
+                self.logger.error("Screenshot %s FAIL CONNECTION ERROR", tag)
+                return
+            browser = self._get_browser()
+            self.logger.info("Loading the page on %s, then waiting up to %s seconds for the document to be complete", tag, self.screenshot_delay)
+            browser.get(endpoint)
+            browser.wait_for_ready_state(int(self.screenshot_delay))
             self.logger.info("Taking screenshot of %s at %s", tag, endpoint)
-            driver.get_screenshot_as_file(f"{self.outdir}/{tag}.png")
+            png: bytes = browser.screenshot()
+            # The screenshot is uploaded straight from memory, only write it to disk when nothing is uploaded.
+            if os.environ.get("DRY_RUN") == "true":
+                with open(f"{self.outdir}/{tag}.png", "wb") as file:
+                    file.write(png)
+            with self._lock:
+                self._pending_uploads.append((f"{tag}.png", png, "image/png"))
             self.tag_report_tests[tag]["test"]["Get screenshot"] = (dict(sorted({
                 "status":"PASS",
                 "message":"-"}.items())))
@@ -616,23 +926,24 @@ class CI(SetEnvs):
                 "status":"FAIL",
                 "message": f"CONNECTION ERROR: {str(error)}"}.items())))
             self.logger.exception("Screenshot %s FAIL CONNECTION ERROR", tag)
-        except TimeoutException as error:
+        except TimeoutError as error:
             self.tag_report_tests[tag]["test"]["Get screenshot"] = (dict(sorted({
                 "status":"FAIL",
                 "message":f"TIMEOUT: {str(error)}"}.items())))
             self.logger.exception("Screenshot %s FAIL TIMEOUT", tag)
-        except (WebDriverException, Exception) as error:
+            self._discard_browser(browser)  # The abandoned page may still fire events, don't hand it to the next tag
+            browser = None
+        except (CDPError, Exception) as error:
             self.tag_report_tests[tag]["test"]["Get screenshot"] = (dict(sorted({
                 "status":"FAIL",
                 "message":f"UNKNOWN: {str(error)}"}.items())))
             self.logger.exception("Screenshot %s FAIL UNKNOWN", tag)
+            self._discard_browser(browser)  # The browser may be in a broken state, don't hand it to the next tag
+            browser = None
         finally:
-            try:
-                driver.quit()
-            except Exception:
-                self.logger.exception("Failed to quit the driver")
+            self._release_browser(browser)
 
-    @deprecated(reason="Use the chrome driver directly instead")
+    @deprecated(reason="Use the chrome browser directly instead")
     def start_tester(self, proto:str, endpoint:str, tag:str) -> tuple[Container,str]:
         """Spin up an RDP test container to load the container web ui.
 
@@ -663,25 +974,14 @@ class CI(SetEnvs):
         return testercontainer, testerendpoint
 
 
-    def setup_driver(self) -> WebDriver:
-        """Return a single ChromiumDriver object the class can use
+    def setup_browser(self) -> ChromeBrowser:
+        """Start and return a new headless Chrome browser the class can use
 
         Returns:
-            Webdriver: Returns a Chromedriver object
+            ChromeBrowser: Returns a Chrome browser driven over the DevTools protocol
         """
-        self.logger.info("Init Chromedriver")
-        # Selenium webdriver options
-        chrome_options = webdriver.ChromeOptions()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920x1080")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--ignore-certificate-errors")
-        chrome_options.add_argument("--disable-dev-shm-usage")  # https://developers.google.com/web/tools/puppeteer/troubleshooting#tips
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.set_page_load_timeout(60)
-        return driver
+        self.logger.info("Init Chrome")
+        return ChromeBrowser(window_size=(1280, 800), page_load_timeout=60)
 
     @testing
     def create_s3_client(self) -> boto3.client:
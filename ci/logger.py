@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
 import os
+import copy
+import atexit
 import logging
+import queue
 from logging import Logger
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from logging import LogRecord
 import re
 import platform
@@ -18,6 +21,7 @@ else:
     log_dir = os.path.join(os.getcwd(),'ci.log')
 
 logger: Logger = logging.getLogger()
+listener: QueueListener | None = None
 
 class ColorPercentStyle(logging.PercentStyle):
     """Custom log formatter that add color to specific log levels."""
@@ -45,6 +49,19 @@ class ColorPercentStyle(logging.PercentStyle):
     def _format(self, record:LogRecord) -> str:
         return self._get_fmt(record.levelno) % record.__dict__
 
+class RecordQueueHandler(QueueHandler):
+    """Queue handler that merges the message arguments but keeps exc_info.
+
+    The message is merged on the calling thread so mutable arguments are logged with their state at the call.
+    The default QueueHandler also formats the exception into the message, which would strip the
+    exc_info the CustomLogFormatter needs to put exceptions on a single line.
+    """
+    def prepare(self, record:LogRecord) -> LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 class CustomLogFormatter(logging.Formatter):
     """Formatter that removes creds from logs."""
     ACCESS_KEY: str = os.environ.get("ACCESS_KEY","super_secret_key")
@@ -74,8 +91,13 @@ class CustomLogFormatter(logging.Formatter):
         return ColorPercentStyle(self._fmt).format(record)
 
 def configure_logging(log_level:str) -> None:
-    """Setup console and file logging"""
+    """Setup console and file logging
 
+    The handlers run on a QueueListener thread so logging calls only enqueue the record.
+    """
+    global listener
+    if listener:
+        listener.stop()
     logger.handlers = []
     logger.setLevel(log_level)
 
@@ -84,17 +106,31 @@ def configure_logging(log_level:str) -> None:
     cf = CustomLogFormatter('%(asctime)-15s | %(threadName)-17s | %(name)-10s | %(levelname)-8s | (%(module)s.%(funcName)s|line:%(lineno)d) | %(message)s |', '%d/%m/%Y %H:%M:%S')
     ch.setFormatter(cf)
     ch.setLevel(log_level)
-    logger.addHandler(ch)
 
     # File logging
     fh = TimedRotatingFileHandler(log_dir, when="midnight", interval=1, backupCount=7, delay=True, encoding='utf-8')
     f = CustomLogFormatter('%(asctime)-15s | %(threadName)-17s | %(name)-10s | %(levelname)-8s | (%(module)s.%(funcName)s|line:%(lineno)d) | %(message)s |', '%d/%m/%Y %H:%M:%S')
     fh.setFormatter(f)
     fh.setLevel(log_level)
-    logger.addHandler(fh)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    logger.addHandler(RecordQueueHandler(log_queue))
+    listener = QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    listener.start()
 
     logging.info('Operating system: %s', platform.platform())
     logging.info('Python version: %s', platform.python_version())
     if log_level.upper() == "DEBUG":
         logging.getLogger("botocore").setLevel(logging.WARNING) # Mute boto3 logging output
         logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING) # Mute urllib3.connectionpool logging output
+
+def flush_logging() -> None:
+    """Block until every queued log record has been written by the handlers."""
+    if listener:
+        listener.stop()  # Processes the remaining records before the thread exits
+        listener.start()
+
+@atexit.register
+def _stop_listener() -> None:
+    if listener:
+        listener.stop()